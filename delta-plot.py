@@ -1,51 +1,83 @@
 import numpy as np
 import matplotlib.pyplot as plt
-
-# Define the Lorenz system
-def lorenz(x, y, z, s=10, r=28, b=8/3):
-    x_dot = s * (y - x)
-    y_dot = r * x - y - x * z
-    z_dot = x * y - b * z
-    return x_dot, y_dot, z_dot
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import LogNorm, to_rgba
+from matplotlib.lines import Line2D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+from lorenz import integrate_pair, simulate_ensemble_gpu
 
 # Set initial conditions and time step
-dt = 0.01
-num_steps = 10000
-
-# Function to generate Lorenz attractor trajectory
-def generate_lorenz_trajectory(x0, y0, z0, num_steps):
-    xs = np.empty(num_steps + 1)
-    ys = np.empty(num_steps + 1)
-    zs = np.empty(num_steps + 1)
-    xs[0], ys[0], zs[0] = x0, y0, z0
-
-    for i in range(num_steps):
-        x_dot, y_dot, z_dot = lorenz(xs[i], ys[i], zs[i])
-        xs[i + 1] = xs[i] + (x_dot * dt)
-        ys[i + 1] = ys[i] + (y_dot * dt)
-        zs[i + 1] = zs[i] + (z_dot * dt)
-    
-    return xs, ys, zs
+dt = 0.02
+num_steps = 5000
+
+# Skip the first tenth of the steps, the transient approach to the attractor
+num_burn = num_steps // 10
+num_record = num_steps - num_burn
+
+# Set the classical Lorenz parameters
+sigma, rho, beta = 10.0, 28.0, 8 / 3
 
 # Set initial values
 x_init, y_init, z_init = 1.0, 1.0, 1.0
 delta = 0.01  # Small difference in initial condition
 
-# Generate two trajectories with slightly different initial conditions
-xs1, ys1, zs1 = generate_lorenz_trajectory(x_init, y_init, z_init, num_steps)
-xs2, ys2, zs2 = generate_lorenz_trajectory(x_init + delta, y_init, z_init, num_steps)
+# Generate two trajectories with slightly different initial conditions,
+# integrated together into one contiguous single precision buffer
+traj = np.empty((2, num_record + 1, 3), dtype=np.float32)
+traj1, traj2 = traj[0], traj[1]
+integrate_pair(traj1, traj2,
+               x_init, y_init, z_init,
+               x_init + delta, y_init, z_init,
+               sigma, rho, beta, dt, num_burn)
+
+# Simulate an ensemble of perturbed initial conditions, keeping only the
+# initial and final states
+ensemble_size = 1024
+ensemble = simulate_ensemble_gpu(ensemble_size, num_steps, dt, sigma, rho, beta,
+                                 x_init, y_init, z_init, delta,
+                                 record_every=num_steps, seed=0)
+
+# Plot the trajectories, striding dense trajectories down to roughly
+# max_plot_points points since the curve is drawn at screen resolution
+max_plot_points = 3000
+stride = max(1, num_record // max_plot_points)
+
+# Build the segments of both trajectories into a single collection. The
+# first trajectory is drawn in one colour; the perturbed one is coloured by
+# how far it has drifted from the first at each step.
+points = traj[:, ::stride]
+segments = np.concatenate([
+    np.stack([points[0, :-1], points[0, 1:]], axis=1),
+    np.stack([points[1, :-1], points[1, 1:]], axis=1),
+])
+divergence = np.linalg.norm(points[0] - points[1], axis=1)[:-1]
+divergence_colors = ScalarMappable(norm=LogNorm(vmin=max(divergence.min(), 1e-6), vmax=divergence.max()),
+                                   cmap='viridis')
+reference_color = to_rgba('tab:red')
+colors = np.concatenate([
+    np.tile(reference_color, (len(divergence), 1)),
+    divergence_colors.to_rgba(divergence),
+])
+lines = Line3DCollection(segments, linewidths=0.5, colors=colors)
 
-# Plot the trajectories
 fig = plt.figure()
 ax = fig.add_subplot(111, projection='3d')
 
-ax.plot(xs1, ys1, zs1, lw=0.5, label='Trajectory 1')
-ax.plot(xs2, ys2, zs2, lw=0.5, label='Trajectory 2 (x + 0.01)')
+ax.add_collection3d(lines)
+ax.auto_scale_xyz(points[..., 0], points[..., 1], points[..., 2])
+fig.colorbar(divergence_colors, ax=ax, shrink=0.6, label='Distance between the two trajectories')
+ensemble_points = ax.scatter(ensemble[:, -1, 0], ensemble[:, -1, 1], ensemble[:, -1, 2], s=1, c='k',
+                             label=f'Ensemble final states ({ensemble_size} members)')
 
 ax.set_xlabel("X Axis")
 ax.set_ylabel("Y Axis")
 ax.set_zlabel("Z Axis")
 ax.set_title("Lorenz Attractor: Sensitivity to Initial Conditions")
-ax.legend()
+ax.legend(handles=[
+    Line2D([], [], color=reference_color, lw=1, label='Trajectory 1'),
+    Line2D([], [], color=divergence_colors.to_rgba(divergence.max()), lw=1,
+           label='Trajectory 2 (x + 0.01), coloured by distance'),
+    ensemble_points,
+])
 
 plt.show()
@@ -0,0 +1,75 @@
+import numpy as np
+import plotly.graph_objects as go
+from dash import Dash, Input, Output, dcc, html, no_update
+from lorenz import dt, max_steps, plot_title, solvers, t_burn, t_end, valid_initial
+
+# Set initial parameter values
+sigma = 10
+rho = 28
+beta = 8 / 3
+x_init, y_init, z_init = 0.0, 1.0, 1.05
+
+# Create a labelled slider for adjusting a parameter. Sliders only report
+# their value when released, so a drag runs the integrator once.
+def parameter_slider(name, label, low, high, value):
+    return html.Div([
+        html.Label(label),
+        dcc.Slider(id=name, min=low, max=high, value=value, marks=None,
+                   tooltip={'placement': 'bottom'}),
+    ])
+
+# Create a labelled input for setting an initial value, submitted on Enter
+# or when the input loses focus
+def initial_input(name, label, value):
+    return html.Label([label, ' ', dcc.Input(id=name, type='number', value=value, debounce=True)])
+
+# Lay out the page: the WebGL plot, then the solver choice and controls
+app = Dash(__name__)
+app.layout = html.Div([
+    dcc.Graph(id='plot', style={'height': '75vh'}),
+    dcc.RadioItems(id='solver', options=list(solvers), value='DP5(4)', inline=True),
+    parameter_slider('sigma', 'Sigma', 0, 20, sigma),
+    parameter_slider('rho', 'Rho', 0, 50, rho),
+    parameter_slider('beta', 'Beta', 0, 5, beta),
+    initial_input('x0', 'X0', x_init),
+    initial_input('y0', 'Y0', y_init),
+    initial_input('z0', 'Z0', z_init),
+])
+
+# Function to rebuild the plot. The figure is drawn by WebGL in the browser,
+# so the whole trajectory is sent without downsampling.
+@app.callback(
+    Output('plot', 'figure'),
+    Input('solver', 'value'),
+    Input('sigma', 'value'),
+    Input('rho', 'value'),
+    Input('beta', 'value'),
+    Input('x0', 'value'),
+    Input('y0', 'value'),
+    Input('z0', 'value'),
+)
+def update(solver, s, r, b, x0, y0, z0):
+    # Empty or malformed number inputs arrive as None; keep the old plot for
+    # those and for values the solvers cannot handle
+    if None in (x0, y0, z0) or not all(valid_initial(float(v)) for v in (x0, y0, z0)):
+        return no_update
+
+    # Generate the Lorenz fractal with the updated parameters. Callbacks may
+    # run concurrently, so each one integrates into its own buffer.
+    solve, rtol, atol = solvers[solver]
+    traj = np.empty((max_steps + 1, 3), dtype=np.float32)
+    n, t = solve(traj, float(x0), float(y0), float(z0),
+                 float(s), float(r), float(b),
+                 t_end, dt, rtol, atol, t_burn)
+
+    fig = go.Figure(go.Scatter3d(x=traj[:n + 1, 0], y=traj[:n + 1, 1], z=traj[:n + 1, 2],
+                                 mode='lines', line=dict(width=1)))
+    fig.update_layout(
+        title=plot_title(t),
+        scene=dict(xaxis_title="X Axis", yaxis_title="Y Axis", zaxis_title="Z Axis"),
+        # Keep the camera where the user left it across updates
+        uirevision='lorenz',
+    )
+    return fig
+
+app.run()
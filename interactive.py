@@ -1,21 +1,24 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider, TextBox
+from matplotlib.widgets import RadioButtons, Slider, TextBox
+from lorenz import dt, max_steps, plot_title, solvers, t_burn, t_end, valid_initial
 
-# Define the Lorenz system
-def lorenz(x, y, z, s, r, b):
-    x_dot = s * (y - x)
-    y_dot = r * x - y - x * z
-    z_dot = x * y - b * z
-    return x_dot, y_dot, z_dot
+# Plot roughly this many points at most; denser trajectories are strided
+max_plot_points = 3000
 
-# Set initial conditions and time step
-dt = 0.01
-num_steps = 10000
+# Allocate the trajectory buffer once and reuse it on every update. It is
+# only displayed, so single precision storage is plenty.
+traj = np.empty((max_steps + 1, 3), dtype=np.float32)
 
-# Create a figure and axis for the plot
+# Create a figure and axis for the plot, with a single line artist whose
+# data is replaced on every update
 fig = plt.figure()
 ax = fig.add_subplot(111, projection='3d')
+line, = ax.plot([], [], [], lw=0.5)
+ax.set_xlabel("X Axis")
+ax.set_ylabel("Y Axis")
+ax.set_zlabel("Z Axis")
+ax.set_title("Lorenz Fractal")
 
 # Set initial parameter values
 sigma = 10
@@ -23,39 +26,55 @@ rho = 28
 beta = 8 / 3
 x_init, y_init, z_init = 0.0, 1.0, 1.05
 
+# Current initial values, parsed only when a text box is submitted
+initial = [x_init, y_init, z_init]
+
 # Function to update the plot
 def update(val):
-    # Get the current values of the sliders and text boxes
+    # Get the current values of the sliders, initial values and solver choice
+    solve, rtol, atol = solvers[solver_buttons.value_selected]
     s = sigma_slider.val
     r = rho_slider.val
     b = beta_slider.val
-    x0 = float(x_text_box.text)
-    y0 = float(y_text_box.text)
-    z0 = float(z_text_box.text)
-
-    # Initialize arrays to store the trajectory
-    xs = np.empty(num_steps + 1)
-    ys = np.empty(num_steps + 1)
-    zs = np.empty(num_steps + 1)
-
-    # Set initial values
-    xs[0], ys[0], zs[0] = x0, y0, z0
+    x0, y0, z0 = initial
 
     # Generate the Lorenz fractal with the updated parameters
-    for i in range(num_steps):
-        x_dot, y_dot, z_dot = lorenz(xs[i], ys[i], zs[i], s, r, b)
-        xs[i + 1] = xs[i] + (x_dot * dt)
-        ys[i + 1] = ys[i] + (y_dot * dt)
-        zs[i + 1] = zs[i] + (z_dot * dt)
+    n, t = solve(traj, x0, y0, z0, float(s), float(r), float(b),
+                 t_end, dt, rtol, atol, t_burn)
 
     # Update the plot with the new trajectory
-    ax.clear()
-    ax.plot(xs, ys, zs, lw=0.5)
-    ax.set_xlabel("X Axis")
-    ax.set_ylabel("Y Axis")
-    ax.set_zlabel("Z Axis")
-    ax.set_title("Lorenz Fractal")
-    plt.draw()
+    stride = max(1, n // max_plot_points)
+    xs, ys, zs = traj[:n + 1:stride, 0], traj[:n + 1:stride, 1], traj[:n + 1:stride, 2]
+    line.set_data_3d(xs, ys, zs)
+    ax.auto_scale_xyz(xs, ys, zs)
+    ax.set_title(plot_title(t))
+    fig.canvas.draw_idle()
+
+# Return a text box callback that stores its parsed value in initial[index]
+# and updates the plot; malformed or out-of-range text is ignored and the
+# old value kept
+def submit_initial(index):
+    def submit(text):
+        try:
+            value = float(text)
+        except ValueError:
+            return
+        if not valid_initial(value):
+            return
+        initial[index] = value
+        update(None)
+    return submit
+
+# Delay slider updates until the slider has been still for debounce_ms, so a
+# drag runs the integrator once instead of on every intermediate value
+debounce_ms = 50
+update_timer = fig.canvas.new_timer(interval=debounce_ms)
+update_timer.single_shot = True
+update_timer.add_callback(update, None)
+
+def debounced_update(val):
+    update_timer.stop()
+    update_timer.start()
 
 # Create sliders for adjusting parameters
 ax_sigma = plt.axes([0.2, 0.02, 0.65, 0.03])
@@ -77,13 +96,18 @@ y_text_box = TextBox(ax_y_init, 'Y0', initial=str(y_init))
 ax_z_init = plt.axes([0.7, 0.14, 0.15, 0.05])
 z_text_box = TextBox(ax_z_init, 'Z0', initial=str(z_init))
 
+# Create radio buttons for choosing the solver
+ax_solver = plt.axes([0.02, 0.78, 0.2, 0.15])
+solver_buttons = RadioButtons(ax_solver, list(solvers))
+
 # Call the update function when the slider value is changed or text box is submitted
-sigma_slider.on_changed(update)
-rho_slider.on_changed(update)
-beta_slider.on_changed(update)
-x_text_box.on_submit(update)
-y_text_box.on_submit(update)
-z_text_box.on_submit(update)
+sigma_slider.on_changed(debounced_update)
+rho_slider.on_changed(debounced_update)
+beta_slider.on_changed(debounced_update)
+x_text_box.on_submit(submit_initial(0))
+y_text_box.on_submit(submit_initial(1))
+z_text_box.on_submit(submit_initial(2))
+solver_buttons.on_clicked(update)
 
 # Generate the initial plot
 update(None)
@@ -0,0 +1,475 @@
+import math
+import warnings
+
+import numpy as np
+from numba import njit, prange
+
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
+# Errors that mean CuPy is installed but cannot run the ensemble kernel: no
+# usable device or driver, or a failed NVRTC compile
+_CUDA_ERRORS = ()
+if cp is not None:
+    _CUDA_ERRORS = (cp.cuda.runtime.CUDARuntimeError,
+                    cp.cuda.driver.CUDADriverError,
+                    cp.cuda.compiler.CompileException)
+
+# Define the Lorenz system
+@njit(inline='always')
+def lorenz(x, y, z, s, r, b):
+    x_dot = s * (y - x)
+    y_dot = r * x - y - x * z
+    z_dot = x * y - b * z
+    return x_dot, y_dot, z_dot
+
+# Advance the state by one classical fourth-order Runge-Kutta step. The
+# caller hoists dt_half = dt / 2 and dt_sixth = dt / 6 out of its loop.
+@njit(inline='always')
+def rk4_step(x, y, z, s, r, b, dt, dt_half, dt_sixth):
+    k1x, k1y, k1z = lorenz(x, y, z, s, r, b)
+    k2x, k2y, k2z = lorenz(x + dt_half * k1x, y + dt_half * k1y, z + dt_half * k1z, s, r, b)
+    k3x, k3y, k3z = lorenz(x + dt_half * k2x, y + dt_half * k2y, z + dt_half * k2z, s, r, b)
+    k4x, k4y, k4z = lorenz(x + dt * k3x, y + dt * k3y, z + dt * k3z, s, r, b)
+    x = x + dt_sixth * (k1x + 2 * k2x + 2 * k3x + k4x)
+    y = y + dt_sixth * (k1y + 2 * k2y + 2 * k3y + k4y)
+    z = z + dt_sixth * (k1z + 2 * k2z + 2 * k3z + k4z)
+    return x, y, z
+
+# Integrate a trajectory with classical fourth-order Runge-Kutta steps into
+# out, an (n + 1, 3) array holding one x, y, z row per step. The state is
+# kept in double precision scalars so the whole loop compiles down to native
+# code; out may be float32 when the trajectory is only plotted. The first
+# num_burn steps, the transient towards the attractor, are taken without
+# being stored.
+@njit(cache=True, fastmath=True)
+def integrate_rk4(out, x0, y0, z0, s, r, b, dt, num_burn=0):
+    dt_half, dt_sixth = 0.5 * dt, dt / 6
+    x, y, z = x0, y0, z0
+    for i in range(num_burn):
+        x, y, z = rk4_step(x, y, z, s, r, b, dt, dt_half, dt_sixth)
+    out[0, 0], out[0, 1], out[0, 2] = x, y, z
+
+    for i in range(out.shape[0] - 1):
+        x, y, z = rk4_step(x, y, z, s, r, b, dt, dt_half, dt_sixth)
+        out[i + 1, 0] = x
+        out[i + 1, 1] = y
+        out[i + 1, 2] = z
+
+# Integrate two trajectories side by side with RK4. Both states advance in
+# the same loop body, giving the CPU two independent dependency chains to
+# interleave instead of walking the step loop twice. num_burn is as for
+# integrate_rk4.
+@njit(cache=True, fastmath=True)
+def integrate_pair(out1, out2, x01, y01, z01, x02, y02, z02, s, r, b, dt, num_burn=0):
+    dt_half, dt_sixth = 0.5 * dt, dt / 6
+    x1, y1, z1 = x01, y01, z01
+    x2, y2, z2 = x02, y02, z02
+    for i in range(num_burn):
+        x1, y1, z1 = rk4_step(x1, y1, z1, s, r, b, dt, dt_half, dt_sixth)
+        x2, y2, z2 = rk4_step(x2, y2, z2, s, r, b, dt, dt_half, dt_sixth)
+    out1[0, 0], out1[0, 1], out1[0, 2] = x1, y1, z1
+    out2[0, 0], out2[0, 1], out2[0, 2] = x2, y2, z2
+
+    for i in range(out1.shape[0] - 1):
+        x1, y1, z1 = rk4_step(x1, y1, z1, s, r, b, dt, dt_half, dt_sixth)
+        x2, y2, z2 = rk4_step(x2, y2, z2, s, r, b, dt, dt_half, dt_sixth)
+        out1[i + 1, 0], out1[i + 1, 1], out1[i + 1, 2] = x1, y1, z1
+        out2[i + 1, 0], out2[i + 1, 1], out2[i + 1, 2] = x2, y2, z2
+
+# Number of ensemble members integrated together by one thread
+_ENSEMBLE_BLOCK = 64
+
+# Integrate an ensemble of trajectories with RK4. state is an (m, 3) array
+# of initial conditions and out an (m, n_record, 3) array that receives the
+# state every record_every steps. The members are independent: blocks of
+# them run in parallel across cores, and within a block the inner loop over
+# members vectorizes.
+@njit(cache=True, fastmath=True, parallel=True)
+def integrate_ensemble(out, state, s, r, b, dt, record_every=1):
+    dt_half, dt_sixth = 0.5 * dt, dt / 6
+    m = state.shape[0]
+    for block in prange((m + _ENSEMBLE_BLOCK - 1) // _ENSEMBLE_BLOCK):
+        lo = block * _ENSEMBLE_BLOCK
+        hi = min(lo + _ENSEMBLE_BLOCK, m)
+        xs = state[lo:hi, 0].copy()
+        ys = state[lo:hi, 1].copy()
+        zs = state[lo:hi, 2].copy()
+        for k in range(hi - lo):
+            out[lo + k, 0, 0], out[lo + k, 0, 1], out[lo + k, 0, 2] = xs[k], ys[k], zs[k]
+
+        for i in range(1, out.shape[1]):
+            for j in range(record_every):
+                for k in range(hi - lo):
+                    xs[k], ys[k], zs[k] = rk4_step(xs[k], ys[k], zs[k], s, r, b, dt, dt_half, dt_sixth)
+            for k in range(hi - lo):
+                out[lo + k, i, 0], out[lo + k, i, 1], out[lo + k, i, 2] = xs[k], ys[k], zs[k]
+
+# CUDA kernel for the ensemble: each thread owns one member, keeps its state
+# in registers for the whole run and writes a row every record_every steps
+_ENSEMBLE_SOURCE = r'''
+__device__ void lorenz(float x, float y, float z, float s, float r, float b,
+                       float* x_dot, float* y_dot, float* z_dot)
+{
+    *x_dot = s * (y - x);
+    *y_dot = r * x - y - x * z;
+    *z_dot = x * y - b * z;
+}
+
+extern "C" __global__
+void lorenz_ensemble(const float* state, float* out, int m, int n_record,
+                     int record_every, float s, float r, float b, float dt)
+{
+    int k = blockDim.x * blockIdx.x + threadIdx.x;
+    if (k >= m) {
+        return;
+    }
+
+    float x = state[3 * k], y = state[3 * k + 1], z = state[3 * k + 2];
+    float* row = out + (size_t)k * n_record * 3;
+    row[0] = x;
+    row[1] = y;
+    row[2] = z;
+
+    float dt_half = 0.5f * dt, dt_sixth = dt / 6.0f;
+    float k1x, k1y, k1z, k2x, k2y, k2z, k3x, k3y, k3z, k4x, k4y, k4z;
+    for (int i = 1; i < n_record; i++) {
+        for (int j = 0; j < record_every; j++) {
+            lorenz(x, y, z, s, r, b, &k1x, &k1y, &k1z);
+            lorenz(x + dt_half * k1x, y + dt_half * k1y, z + dt_half * k1z, s, r, b, &k2x, &k2y, &k2z);
+            lorenz(x + dt_half * k2x, y + dt_half * k2y, z + dt_half * k2z, s, r, b, &k3x, &k3y, &k3z);
+            lorenz(x + dt * k3x, y + dt * k3y, z + dt * k3z, s, r, b, &k4x, &k4y, &k4z);
+            x += dt_sixth * (k1x + 2.0f * k2x + 2.0f * k3x + k4x);
+            y += dt_sixth * (k1y + 2.0f * k2y + 2.0f * k3y + k4y);
+            z += dt_sixth * (k1z + 2.0f * k2z + 2.0f * k3z + k4z);
+        }
+        row[3 * i] = x;
+        row[3 * i + 1] = y;
+        row[3 * i + 2] = z;
+    }
+}
+'''
+
+_ensemble_kernel = None
+
+# Set once the CUDA path has failed, so later calls go straight to Numba
+_cuda_failed = False
+
+# Integrate the ensemble from state into out with the CUDA kernel
+def _simulate_ensemble_cuda(out, state, s, r, b, dt, record_every):
+    global _ensemble_kernel
+
+    if _ensemble_kernel is None:
+        _ensemble_kernel = cp.RawKernel(_ENSEMBLE_SOURCE, 'lorenz_ensemble')
+
+    m, n_record = out.shape[0], out.shape[1]
+    state_gpu = cp.asarray(state, dtype=cp.float32)
+    out_gpu = cp.empty((m, n_record, 3), dtype=cp.float32)
+    threads = 256
+    blocks = (m + threads - 1) // threads
+    _ensemble_kernel((blocks,), (threads,),
+                     (state_gpu, out_gpu, np.int32(m), np.int32(n_record),
+                      np.int32(record_every), np.float32(s), np.float32(r),
+                      np.float32(b), np.float32(dt)))
+    cp.asnumpy(out_gpu, out=out)
+
+# Simulate m trajectories whose initial conditions are jittered around
+# (x0, y0, z0) by normal noise of size delta. Runs as one CUDA launch in
+# single precision when CuPy is installed and a CUDA device is usable, and
+# falls back to the Numba ensemble kernel otherwise, with a warning the
+# first time the CUDA path fails. Returns an
+# (m, num_steps // record_every + 1, 3) float32 NumPy array, written into
+# out if given so that repeated runs can reuse one buffer. seed may also be
+# an np.random.Generator, which is used as is, so a sweep of many runs can
+# share one generator.
+def simulate_ensemble_gpu(m, num_steps, dt, s, r, b, x0, y0, z0, delta,
+                          record_every=1, seed=None, out=None):
+    global _cuda_failed
+
+    if record_every < 1:
+        raise ValueError("record_every must be at least 1")
+
+    n_record = num_steps // record_every + 1
+    if out is None:
+        out = np.empty((m, n_record, 3), dtype=np.float32)
+    elif out.shape != (m, n_record, 3) or out.dtype != np.float32:
+        raise ValueError(f"out must be a float32 array of shape {(m, n_record, 3)}")
+
+    rng = np.random.default_rng(seed)
+    state = np.array([x0, y0, z0]) + delta * rng.standard_normal((m, 3))
+
+    if cp is not None and not _cuda_failed:
+        try:
+            _simulate_ensemble_cuda(out, state, s, r, b, dt, record_every)
+            return out
+        except _CUDA_ERRORS as e:
+            warnings.warn(f"CUDA ensemble kernel failed ({e!r}); using the Numba "
+                          "kernel for this and later runs", RuntimeWarning, stacklevel=2)
+            _cuda_failed = True
+
+    integrate_ensemble(out, state, float(s), float(r), float(b), float(dt), record_every)
+    return out
+
+# Fast-math flags for the adaptive solvers. They leave out nnan and ninf,
+# which would let LLVM fold away the checks that stop a blown-up run.
+_ADAPTIVE_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+# Integrate a trajectory up to t_end with the adaptive Dormand-Prince 5(4)
+# pair. The embedded fourth-order solution shares the stages of the
+# fifth-order one, and the last stage is reused as the first stage of the
+# next step (FSAL), so an accepted step costs six evaluations. The step size
+# follows a PI controller on the scaled error norm. Accepted points after
+# t_burn are written to the rows of out. Every attempted step, burn-in and
+# rejected ones included, counts against a budget of twice the rows of out,
+# so a start far from the attractor cannot stall the loop, and a state that
+# overflows to inf or NaN ends it at once. Returns the number of steps
+# stored and the time reached, which is short of t_end when the run stopped
+# early for any of these reasons.
+@njit(cache=True, fastmath=_ADAPTIVE_FASTMATH)
+def integrate_dp54(out, x0, y0, z0, s, r, b, t_end, dt, rtol, atol, t_burn=0.0):
+    max_steps = out.shape[0] - 1
+    x, y, z = x0, y0, z0
+
+    # Nothing is stored until t_burn has been reached, so it must come before
+    # t_end for out[0] to be written
+    if t_burn > 0.0 and t_burn >= t_end:
+        raise ValueError("t_burn must be less than t_end")
+    recording = t_burn <= 0.0
+    if recording:
+        out[0, 0], out[0, 1], out[0, 2] = x, y, z
+
+    # Difference between the fifth- and fourth-order weights
+    e1, e3, e4 = 71 / 57600, -71 / 16695, 71 / 1920
+    e5, e6, e7 = -17253 / 339200, 22 / 525, -1 / 40
+
+    # PI step size control constants
+    alpha, beta = 0.2 - 0.75 * 0.04, 0.04
+    err_prev = 1e-4
+
+    k1x, k1y, k1z = lorenz(x, y, z, s, r, b)
+    t = 0.0
+    n = 0
+    budget = 2 * max_steps
+    while t < t_end and n < max_steps and budget > 0:
+        budget -= 1
+        t_stop = t_end if recording else t_burn
+        last = t + dt >= t_stop
+        if last:
+            dt = t_stop - t
+
+        k2x, k2y, k2z = lorenz(x + dt * (k1x / 5),
+                               y + dt * (k1y / 5),
+                               z + dt * (k1z / 5), s, r, b)
+        k3x, k3y, k3z = lorenz(x + dt * (3 / 40 * k1x + 9 / 40 * k2x),
+                               y + dt * (3 / 40 * k1y + 9 / 40 * k2y),
+                               z + dt * (3 / 40 * k1z + 9 / 40 * k2z), s, r, b)
+        k4x, k4y, k4z = lorenz(x + dt * (44 / 45 * k1x - 56 / 15 * k2x + 32 / 9 * k3x),
+                               y + dt * (44 / 45 * k1y - 56 / 15 * k2y + 32 / 9 * k3y),
+                               z + dt * (44 / 45 * k1z - 56 / 15 * k2z + 32 / 9 * k3z), s, r, b)
+        k5x, k5y, k5z = lorenz(x + dt * (19372 / 6561 * k1x - 25360 / 2187 * k2x + 64448 / 6561 * k3x - 212 / 729 * k4x),
+                               y + dt * (19372 / 6561 * k1y - 25360 / 2187 * k2y + 64448 / 6561 * k3y - 212 / 729 * k4y),
+                               z + dt * (19372 / 6561 * k1z - 25360 / 2187 * k2z + 64448 / 6561 * k3z - 212 / 729 * k4z), s, r, b)
+        k6x, k6y, k6z = lorenz(x + dt * (9017 / 3168 * k1x - 355 / 33 * k2x + 46732 / 5247 * k3x + 49 / 176 * k4x - 5103 / 18656 * k5x),
+                               y + dt * (9017 / 3168 * k1y - 355 / 33 * k2y + 46732 / 5247 * k3y + 49 / 176 * k4y - 5103 / 18656 * k5y),
+                               z + dt * (9017 / 3168 * k1z - 355 / 33 * k2z + 46732 / 5247 * k3z + 49 / 176 * k4z - 5103 / 18656 * k5z), s, r, b)
+
+        # Fifth-order solution, which is also the point of the seventh stage
+        x_new = x + dt * (35 / 384 * k1x + 500 / 1113 * k3x + 125 / 192 * k4x - 2187 / 6784 * k5x + 11 / 84 * k6x)
+        y_new = y + dt * (35 / 384 * k1y + 500 / 1113 * k3y + 125 / 192 * k4y - 2187 / 6784 * k5y + 11 / 84 * k6y)
+        z_new = z + dt * (35 / 384 * k1z + 500 / 1113 * k3z + 125 / 192 * k4z - 2187 / 6784 * k5z + 11 / 84 * k6z)
+        k7x, k7y, k7z = lorenz(x_new, y_new, z_new, s, r, b)
+
+        # Local error estimate, scaled by the mixed tolerance per component
+        ex = dt * (e1 * k1x + e3 * k3x + e4 * k4x + e5 * k5x + e6 * k6x + e7 * k7x)
+        ey = dt * (e1 * k1y + e3 * k3y + e4 * k4y + e5 * k5y + e6 * k6y + e7 * k7y)
+        ez = dt * (e1 * k1z + e3 * k3z + e4 * k4z + e5 * k5z + e6 * k6z + e7 * k7z)
+        ex /= atol + rtol * max(abs(x), abs(x_new))
+        ey /= atol + rtol * max(abs(y), abs(y_new))
+        ez /= atol + rtol * max(abs(z), abs(z_new))
+        err = np.sqrt((ex * ex + ey * ey + ez * ez) / 3)
+
+        if err <= 1.0:
+            t = t_stop if last else t + dt
+            x, y, z = x_new, y_new, z_new
+            k1x, k1y, k1z = k7x, k7y, k7z
+            if recording:
+                n += 1
+                out[n, 0], out[n, 1], out[n, 2] = x, y, z
+            elif last:
+                recording = True
+                out[0, 0], out[0, 1], out[0, 2] = x, y, z
+
+            if err == 0.0:
+                factor = 5.0
+            else:
+                factor = 0.9 * err ** -alpha * err_prev ** beta
+            err_prev = max(err, 1e-4)
+            dt *= min(5.0, max(0.1, factor))
+        elif not np.isfinite(err):
+            # The state has blown up and no smaller step will recover it
+            break
+        else:
+            dt *= max(0.1, 0.9 * err ** -0.2)
+
+    # The run stopped during the burn-in, so out[0] holds the state reached
+    if not recording:
+        out[0, 0], out[0, 1], out[0, 2] = x, y, z
+    return n, t
+
+# Fill out with the Jacobian of the Lorenz system at (x, y, z)
+@njit(cache=True)
+def lorenz_jac(x, y, z, s, r, b, out):
+    out[0, 0], out[0, 1], out[0, 2] = -s, s, 0.0
+    out[1, 0], out[1, 1], out[1, 2] = r - z, -1.0, -x
+    out[2, 0], out[2, 1], out[2, 2] = y, x, -b
+
+# Invert the 3x3 matrix a into out through its adjugate
+@njit(inline='always')
+def inv3(a, out):
+    c00 = a[1, 1] * a[2, 2] - a[1, 2] * a[2, 1]
+    c10 = a[1, 2] * a[2, 0] - a[1, 0] * a[2, 2]
+    c20 = a[1, 0] * a[2, 1] - a[1, 1] * a[2, 0]
+    inv_det = 1.0 / (a[0, 0] * c00 + a[0, 1] * c10 + a[0, 2] * c20)
+    out[0, 0] = c00 * inv_det
+    out[0, 1] = (a[0, 2] * a[2, 1] - a[0, 1] * a[2, 2]) * inv_det
+    out[0, 2] = (a[0, 1] * a[1, 2] - a[0, 2] * a[1, 1]) * inv_det
+    out[1, 0] = c10 * inv_det
+    out[1, 1] = (a[0, 0] * a[2, 2] - a[0, 2] * a[2, 0]) * inv_det
+    out[1, 2] = (a[0, 2] * a[1, 0] - a[0, 0] * a[1, 2]) * inv_det
+    out[2, 0] = c20 * inv_det
+    out[2, 1] = (a[0, 1] * a[2, 0] - a[0, 0] * a[2, 1]) * inv_det
+    out[2, 2] = (a[0, 0] * a[1, 1] - a[0, 1] * a[1, 0]) * inv_det
+
+# Multiply the 3x3 matrix m by the vector (x, y, z)
+@njit(inline='always')
+def matvec3(m, x, y, z):
+    return (m[0, 0] * x + m[0, 1] * y + m[0, 2] * z,
+            m[1, 0] * x + m[1, 1] * y + m[1, 2] * z,
+            m[2, 0] * x + m[2, 1] * y + m[2, 2] * z)
+
+# Integrate a trajectory up to t_end with the linearly implicit Rosenbrock
+# 2(3) method of Shampine and Reichelt, which stays stable at large steps in
+# stiff parameter regimes. Each step factors W = I - dt * d * J once, using
+# the analytic Jacobian, and reuses it for all three stages. Being second
+# order, it wants looser tolerances than integrate_dp54 (rtol around 1e-3);
+# otherwise it takes the same arguments and returns the same values.
+@njit(cache=True, fastmath=_ADAPTIVE_FASTMATH)
+def integrate_rosenbrock23(out, x0, y0, z0, s, r, b, t_end, dt, rtol, atol, t_burn=0.0):
+    max_steps = out.shape[0] - 1
+    x, y, z = x0, y0, z0
+
+    # Nothing is stored until t_burn has been reached, so it must come before
+    # t_end for out[0] to be written
+    if t_burn > 0.0 and t_burn >= t_end:
+        raise ValueError("t_burn must be less than t_end")
+    recording = t_burn <= 0.0
+    if recording:
+        out[0, 0], out[0, 1], out[0, 2] = x, y, z
+
+    d = 1.0 / (2.0 + np.sqrt(2.0))
+    e32 = 6.0 + np.sqrt(2.0)
+    jac = np.empty((3, 3))
+    w = np.empty((3, 3))
+    w_inv = np.empty((3, 3))
+
+    f0x, f0y, f0z = lorenz(x, y, z, s, r, b)
+    t = 0.0
+    n = 0
+    budget = 2 * max_steps
+    while t < t_end and n < max_steps and budget > 0:
+        budget -= 1
+        t_stop = t_end if recording else t_burn
+        last = t + dt >= t_stop
+        if last:
+            dt = t_stop - t
+
+        lorenz_jac(x, y, z, s, r, b, jac)
+        for i in range(3):
+            for j in range(3):
+                w[i, j] = -dt * d * jac[i, j]
+            w[i, i] += 1.0
+        inv3(w, w_inv)
+
+        k1x, k1y, k1z = matvec3(w_inv, f0x, f0y, f0z)
+        f1x, f1y, f1z = lorenz(x + 0.5 * dt * k1x, y + 0.5 * dt * k1y, z + 0.5 * dt * k1z, s, r, b)
+        k2x, k2y, k2z = matvec3(w_inv, f1x - k1x, f1y - k1y, f1z - k1z)
+        k2x, k2y, k2z = k2x + k1x, k2y + k1y, k2z + k1z
+
+        # Second-order solution and the third stage for the error estimate
+        x_new, y_new, z_new = x + dt * k2x, y + dt * k2y, z + dt * k2z
+        f2x, f2y, f2z = lorenz(x_new, y_new, z_new, s, r, b)
+        k3x, k3y, k3z = matvec3(w_inv,
+                                f2x - e32 * (k2x - f1x) - 2.0 * (k1x - f0x),
+                                f2y - e32 * (k2y - f1y) - 2.0 * (k1y - f0y),
+                                f2z - e32 * (k2z - f1z) - 2.0 * (k1z - f0z))
+
+        ex = dt / 6 * (k1x - 2.0 * k2x + k3x)
+        ey = dt / 6 * (k1y - 2.0 * k2y + k3y)
+        ez = dt / 6 * (k1z - 2.0 * k2z + k3z)
+        ex /= atol + rtol * max(abs(x), abs(x_new))
+        ey /= atol + rtol * max(abs(y), abs(y_new))
+        ez /= atol + rtol * max(abs(z), abs(z_new))
+        err = np.sqrt((ex * ex + ey * ey + ez * ez) / 3)
+
+        if err <= 1.0:
+            t = t_stop if last else t + dt
+            x, y, z = x_new, y_new, z_new
+            f0x, f0y, f0z = f2x, f2y, f2z
+            if recording:
+                n += 1
+                out[n, 0], out[n, 1], out[n, 2] = x, y, z
+            elif last:
+                recording = True
+                out[0, 0], out[0, 1], out[0, 2] = x, y, z
+
+            if err == 0.0:
+                factor = 5.0
+            else:
+                factor = 0.9 * err ** (-1 / 3)
+            dt *= min(5.0, max(0.2, factor))
+        elif not np.isfinite(err):
+            # The state has blown up and no smaller step will recover it
+            break
+        else:
+            dt *= max(0.2, 0.9 * err ** (-1 / 3))
+
+    # The run stopped during the burn-in, so out[0] holds the state reached
+    if not recording:
+        out[0, 0], out[0, 1], out[0, 2] = x, y, z
+    return n, t
+
+# Time step and run length shared by the interactive explorers
+dt = 0.02
+num_steps = 5000
+
+# Set the time span for the adaptive solvers, skipping the first tenth of
+# the run, the transient approach to the attractor
+t_end = num_steps * dt
+t_burn = 0.1 * t_end
+max_steps = 50000
+
+# Adaptive solvers to choose from, with their (rtol, atol): the explicit
+# Dormand-Prince pair, and the linearly implicit Rosenbrock method for stiff
+# parameter regimes. Rosenbrock23 is only second order, so it gets the
+# looser tolerances of MATLAB's ode23s.
+solvers = {
+    'DP5(4)': (integrate_dp54, 1e-6, 1e-9),
+    'Rosenbrock23': (integrate_rosenbrock23, 1e-3, 1e-6),
+}
+
+# Title for the plot, noting when a step limit stopped the run before t_end
+def plot_title(t):
+    if t < t_end:
+        return f"Lorenz Fractal (stopped at t = {t:.1f} of {t_end:g}, step limit reached)"
+    return "Lorenz Fractal"
+
+# Largest initial coordinate the explorers accept. The attractor spans a few
+# tens in each coordinate; every start within this bound still reaches t_end
+# with both solvers, while nan, inf or huge values only stall or break them.
+max_initial = 1e3
+
+# Whether value is usable as an initial coordinate in the explorers
+def valid_initial(value):
+    return math.isfinite(value) and abs(value) <= max_initial